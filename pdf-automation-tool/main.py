@@ -4,20 +4,47 @@ Main application entry point
 """
 
 import json
+import logging
+import multiprocessing
 import os
+import queue
+import re
 import threading
 import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import customtkinter as ctk
 from PIL import Image, ImageTk
 from tkinter import filedialog, messagebox
 
-from pdf_utils import generate_preview_image, get_page_count
+from pdf_utils import get_page_count, preview_render_loop
 import pdf_logic
 
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on rendered preview size, so very large monitors don't explode memory
+PREVIEW_MAX_RENDER_SIZE = (1600, 1200)
+
+# Delay before starting a preview render, so rapid navigation clicks coalesce
+PREVIEW_DEBOUNCE_MS = 80
+
+# One well-formed page range entry ("3" or "3-5") between commas
+_RANGE_RE = re.compile(r'(?:^|(?<=,))\s*(\d+)\s*(?:-\s*(\d+)\s*)?(?=,|$)')
+
+# A whole page range string made only of well-formed entries (empty entries allowed)
+_VALID_RANGE_RE = re.compile(r'\s*(?:\d+\s*(?:-\s*\d+\s*)?)?(?:,\s*(?:\d+\s*(?:-\s*\d+\s*)?)?)*')
+
+# Sentinel for configuration keys that are not present
+_MISSING = object()
+
+# Library scan cache: (folder mtime, template paths, template file names)
+_LIBRARY_CACHE: Optional[Tuple[float, List[str], List[str]]] = None
+
+
 def parse_page_range(range_string: str) -> set:
     """
     Parse a page range string into a set of 0-based page indices.
@@ -34,41 +61,93 @@ def parse_page_range(range_string: str) -> set:
     Returns:
         A set of 0-based page indices
     """
+    return set(_parse_page_range_cached(range_string))
+
+
+@lru_cache(maxsize=8)
+def _parse_page_range_cached(range_string: str) -> FrozenSet[int]:
+    """Memoized implementation of parse_page_range (repeat specs skip re-parsing)"""
     if not range_string or not range_string.strip():
-        return set()
+        return frozenset()
     
     excluded_indices = set()
     
-    # Split by commas
-    parts = range_string.split(',')
+    # Match each "N" or "N-M" entry in a single pass; malformed entries don't match
+    for match in _RANGE_RE.finditer(range_string):
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        
+        # Convert 1-based to 0-based and add all valid pages in one bulk update
+        excluded_indices.update(range(max(start, 1) - 1, end))
+    
+    if not _VALID_RANGE_RE.fullmatch(range_string):
+        # Invalid entries (non-numbers) are ignored
+        logger.warning("Ignoring invalid page specification(s) in: '%s'", range_string)
+    
+    return frozenset(excluded_indices)
+
+
+# Title block template opened once per batch worker process
+_worker_template_doc = None
+
+
+def _init_batch_worker(template_bytes: bytes) -> None:
+    """Open the template once when a batch worker process starts"""
+    global _worker_template_doc
+    try:
+        _worker_template_doc = pdf_logic.open_template(template_bytes)
+    except Exception as e:
+        # Leave it unset so each file opens the template itself and reports
+        # the real error, instead of the failed initializer breaking the pool
+        logger.debug("Could not open template in batch worker: %s", e)
+        _worker_template_doc = None
+
+
+def _process_one(
+    file_path: str,
+    template_path: str,
+    output_dir: str,
+    project_data: dict,
+    excluded_pages: Set[int],
+    clean_contents: bool = False
+) -> Tuple[str, bool, Optional[str]]:
+    """
+    Process a single file of a batch (runs in a worker process).
+    
+    Reuses the template opened by _init_batch_worker, if any. Exceptions are
+    caught here so one failing file doesn't abort the batch.
     
-    for part in parts:
-        part = part.strip()
-        if not part:
-            continue
+    Args:
+        file_path: Path to the input customer PDF file
+        template_path: Path to the title block template PDF
+        output_dir: Folder where the processed PDF will be saved
+        project_data: Dictionary containing project metadata
+        excluded_pages: Set of 0-based page indices to exclude
+        clean_contents: Clean/flatten source page contents before placing them
         
-        try:
-            if '-' in part:
-                # Handle range like "3-5"
-                range_parts = part.split('-')
-                if len(range_parts) == 2:
-                    start = int(range_parts[0].strip())
-                    end = int(range_parts[1].strip())
-                    # Convert 1-based to 0-based and add all pages in range
-                    for page in range(start, end + 1):
-                        if page >= 1:  # Only valid page numbers
-                            excluded_indices.add(page - 1)  # Convert to 0-based
-            else:
-                # Handle single number like "1"
-                page = int(part)
-                if page >= 1:  # Only valid page numbers
-                    excluded_indices.add(page - 1)  # Convert to 0-based
-        except ValueError:
-            # Ignore invalid entries (non-numbers)
-            print(f"Warning: Ignoring invalid page specification: '{part}'")
-            continue
+    Returns:
+        Tuple of (filename, success flag, error message or None)
+    """
+    filename = os.path.basename(file_path)
     
-    return excluded_indices
+    try:
+        # Process the PDF file
+        output_filename = f"processed_{filename}"
+        file_output_path = Path(output_dir) / output_filename
+        
+        pdf_logic.process_with_margins(
+            input_path=file_path,
+            template_path=template_path,
+            output_path=str(file_output_path),
+            project_data=project_data,
+            excluded_pages=excluded_pages,
+            template_doc=_worker_template_doc,
+            clean_contents=clean_contents
+        )
+        return filename, True, None
+        
+    except Exception as e:
+        return filename, False, str(e)
 
 
 class ConfigManager:
@@ -77,14 +156,18 @@ class ConfigManager:
     def __init__(self, config_path: str = "config.json"):
         self.config_path = config_path
         self.config: Dict = {}
+        self._resolved: Dict[str, Any] = {}  # Memoized dotted-key lookups
+        self._last_saved_hash: Optional[int] = None  # Hash of config as on disk
         self.load_config()
     
     def load_config(self) -> None:
         """Load configuration from JSON file"""
+        self._resolved.clear()
         try:
             if os.path.exists(self.config_path):
                 with open(self.config_path, 'r', encoding='utf-8') as f:
                     self.config = json.load(f)
+                self._last_saved_hash = self._config_hash()
             else:
                 # Create default config if file doesn't exist
                 self.config = {
@@ -102,32 +185,58 @@ class ConfigManager:
                 }
                 self.save_config()
         except Exception as e:
-            print(f"Error loading config: {e}")
+            logger.error("Error loading config: %s", e)
             self.config = {}
     
     def save_config(self) -> None:
-        """Save configuration to JSON file"""
+        """Save configuration to JSON file (skipped if nothing has changed)"""
+        self._resolved.clear()
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4)
+            config_hash = self._config_hash()
+            if config_hash == self._last_saved_hash:
+                return
+            
+            # Write to a temporary file and rename it into place, so a crash
+            # mid-write never leaves a truncated config behind
+            temp_path = self.config_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.config, f, indent=2)
+            os.replace(temp_path, self.config_path)
+            self._last_saved_hash = config_hash
         except Exception as e:
-            print(f"Error saving config: {e}")
+            logger.error("Error saving config: %s", e)
+    
+    def _config_hash(self) -> int:
+        """Hash the current configuration contents for change detection"""
+        return hash(json.dumps(self.config, sort_keys=True))
     
     def get(self, key: str, default=None):
         """Get configuration value by key (supports dot notation)"""
-        keys = key.split('.')
+        value = self._resolved.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._resolve(key)
+            self._resolved[key] = value
+        
+        if value is _MISSING or value is None:
+            return default
+        return value
+    
+    def _resolve(self, key: str):
+        """Walk the config dict for a dotted key, returning _MISSING if absent"""
         value = self.config
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k, default)
-            else:
-                return default
-        return value if value is not None else default
+        for k in key.split('.'):
+            if not isinstance(value, dict) or k not in value:
+                return _MISSING
+            value = value[k]
+        return value
 
 
 class PDFAutomationApp(ctk.CTk):
     """Main application class for PDF Title Block Automation Tool"""
     
+    # User home directory, resolved once at import
+    _HOME_DIR = os.path.expanduser('~')
+    
     def __init__(self):
         super().__init__()
         
@@ -145,12 +254,40 @@ class PDFAutomationApp(ctk.CTk):
         self.current_file_index: int = 0  # Index of current file being previewed
         self.current_page_index: int = 0  # Index of current page being previewed
         self.current_file_page_count: int = 0  # Total pages in current file
+        
+        # Page count cache: file path -> (mtime, page count)
+        self._page_count_cache: Dict[str, Tuple[float, int]] = {}
+        self._page_count_lock = threading.Lock()  # Serializes get_page_count calls
+        self._selection_generation: int = 0  # Bumped on each new file selection
+        
+        # Preview request tracking (only the latest request is displayed)
+        self._preview_req_id: int = 0
+        self._pending_preview_after: Optional[str] = None
+        
+        # Previews are rendered in a separate process so PDF rasterization
+        # never competes with the Tk main loop for the GIL
+        self._start_preview_process()
+        
+        # Latest-wins queue drained by a single long-lived preview worker
+        self._preview_queue: queue.Queue = queue.Queue(maxsize=1)
+        threading.Thread(target=self._preview_worker, daemon=True).start()
+        
         self.project_data = {
             'project_name': '',
             'client_name': '',
             'date': '',
             'drawn_by': ''
         }
+        self._project_data_after: Optional[str] = None  # Pending debounced update
+        
+        # Preview canvas size, updated from <Configure> events
+        self._canvas_w: int = 800
+        self._canvas_h: int = 600
+        self._resize_after_id: Optional[str] = None  # Pending debounced recenter
+        
+        # Batch worker pool while a batch is running, and app shutdown flag
+        self._batch_executor: Optional[ProcessPoolExecutor] = None
+        self._closing: bool = False
         
         # Setup window
         self.setup_window()
@@ -162,6 +299,16 @@ class PDFAutomationApp(ctk.CTk):
         if not self.template_files:
             self.after(500, self._show_library_warning)
     
+    def _on_close(self) -> None:
+        """Cancel pending batch work and close the application"""
+        self._closing = True
+        
+        # Without this, the interpreter waits at exit for every queued file
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(wait=False, cancel_futures=True)
+        
+        self.destroy()
+    
     def _show_library_warning(self) -> None:
         """Show warning about missing templates on startup"""
         app_dir = Path(__file__).parent
@@ -187,6 +334,9 @@ class PDFAutomationApp(ctk.CTk):
         self.geometry(f"{width}x{height}")
         self.minsize(min_width, min_height)
         
+        # Cancel any running batch when the window is closed
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        
         # Set appearance mode and color theme
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
@@ -227,8 +377,9 @@ class PDFAutomationApp(ctk.CTk):
         template_label.pack(pady=(0, 5), padx=20, fill="x")
         
         # Scan library folder and populate dropdown
-        self.template_files = self._scan_library_folder()
-        template_display_names = [os.path.basename(f) for f in self.template_files] if self.template_files else ["No templates found"]
+        self.template_files, template_names = self._scan_library_folder()
+        self._template_by_basename: Dict[str, str] = dict(zip(template_names, self.template_files))
+        template_display_names = template_names if self.template_files else ["No templates found"]
         
         self.template_dropdown = ctk.CTkComboBox(
             sidebar,
@@ -275,7 +426,7 @@ class PDFAutomationApp(ctk.CTk):
             height=35
         )
         self.project_name_entry.pack(pady=(0, 15), padx=20, fill="x")
-        self.project_name_entry.bind('<KeyRelease>', self.update_project_data)
+        self.project_name_entry.bind('<KeyRelease>', self._schedule_project_update)
         
         # Client Name
         client_label = ctk.CTkLabel(sidebar, text="Client Name:", anchor="w")
@@ -287,7 +438,7 @@ class PDFAutomationApp(ctk.CTk):
             height=35
         )
         self.client_name_entry.pack(pady=(0, 15), padx=20, fill="x")
-        self.client_name_entry.bind('<KeyRelease>', self.update_project_data)
+        self.client_name_entry.bind('<KeyRelease>', self._schedule_project_update)
         
         # Date
         date_label = ctk.CTkLabel(sidebar, text="Date:", anchor="w")
@@ -299,7 +450,7 @@ class PDFAutomationApp(ctk.CTk):
             height=35
         )
         self.date_entry.pack(pady=(0, 15), padx=20, fill="x")
-        self.date_entry.bind('<KeyRelease>', self.update_project_data)
+        self.date_entry.bind('<KeyRelease>', self._schedule_project_update)
         
         # Drawn By
         drawn_by_label = ctk.CTkLabel(sidebar, text="Drawn By:", anchor="w")
@@ -311,7 +462,7 @@ class PDFAutomationApp(ctk.CTk):
             height=35
         )
         self.drawn_by_entry.pack(pady=(0, 15), padx=20, fill="x")
-        self.drawn_by_entry.bind('<KeyRelease>', self.update_project_data)
+        self.drawn_by_entry.bind('<KeyRelease>', self._schedule_project_update)
         
         # Output Destination Section
         output_label = ctk.CTkLabel(sidebar, text="Output Destination:", anchor="w")
@@ -322,7 +473,7 @@ class PDFAutomationApp(ctk.CTk):
         output_frame.pack(pady=(0, 15), padx=20, fill="x")
         
         # Default output path
-        default_output = os.path.join(os.path.expanduser('~'), 'Desktop', 'Leviat_Output')
+        default_output = os.path.join(self._HOME_DIR, 'Desktop', 'Leviat_Output')
         self.output_folder = default_output
         
         self.output_path_entry = ctk.CTkEntry(
@@ -373,10 +524,18 @@ class PDFAutomationApp(ctk.CTk):
         )
         self.preview_canvas.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 5))
         
-        # Display initial "No PDF loaded" text
+        # The canvas only ever shows one image or one message, so create both
+        # items once and show/hide/update them in place
         self.preview_canvas.bind('<Configure>', self._on_canvas_configure)
-        self._canvas_text_id = None
-        self._canvas_image_id = None
+        self._canvas_image_id = self.preview_canvas.create_image(0, 0, anchor="center", state="hidden")
+        self._canvas_text_id = self.preview_canvas.create_text(
+            0, 0,
+            font=("Arial", 14),
+            anchor="center",
+            state="hidden"
+        )
+        
+        # Display initial "No PDF loaded" text
         self._show_canvas_message("No PDF loaded")
         
         # Navigation Control Bar
@@ -525,6 +684,16 @@ class PDFAutomationApp(ctk.CTk):
         )
         self.exclude_pages_entry.pack(side="left")
         
+        # Opt-in content stream cleaning (slow; only needed for malformed PDFs)
+        self.clean_contents_var = tk.BooleanVar(value=False)
+        self.clean_contents_checkbox = ctk.CTkCheckBox(
+            exclude_frame,
+            text="Clean page contents",
+            variable=self.clean_contents_var,
+            font=ctk.CTkFont(size=12)
+        )
+        self.clean_contents_checkbox.pack(side="left", padx=(15, 0))
+        
         # Process & Save Button (right side)
         self.save_export_btn = ctk.CTkButton(
             controls_frame,
@@ -555,7 +724,15 @@ class PDFAutomationApp(ctk.CTk):
             self.current_page_index = 0
             
             # Get page count for first file
-            self.current_file_page_count = get_page_count(self.selected_files[0])
+            self.current_file_page_count = self._cached_page_count(self.selected_files[0])
+            
+            # Fill the page count cache for the remaining files in the background
+            self._selection_generation += 1
+            threading.Thread(
+                target=self._prefetch_page_counts,
+                args=(self.selected_files[1:], self._selection_generation),
+                daemon=True
+            ).start()
             
             # Update legacy single-file references (use first file)
             self.selected_pdf_path = self.selected_files[0]
@@ -573,17 +750,18 @@ class PDFAutomationApp(ctk.CTk):
             
             # Show loading message
             self._show_canvas_message("Loading preview...")
-            self.update()
+            self.preview_canvas.update_idletasks()
             
             # Load preview of the first page of the first file
             self._load_current_preview()
     
-    def _scan_library_folder(self) -> List[str]:
+    def _scan_library_folder(self) -> Tuple[List[str], List[str]]:
         """
         Scan the /library/ folder for PDF template files.
         
         Returns:
-            List of full file paths to PDF files found in the library folder.
+            Tuple of (full file paths, file names) of the PDF files found in
+            the library folder, in the same order.
         """
         # Get the library folder path (relative to the app directory)
         app_dir = Path(__file__).parent
@@ -594,23 +772,41 @@ class PDFAutomationApp(ctk.CTk):
             # Try to create it
             try:
                 library_path.mkdir(parents=True, exist_ok=True)
-                print(f"Created library folder at: {library_path}")
+                logger.info("Created library folder at: %s", library_path)
             except Exception as e:
-                print(f"Could not create library folder: {e}")
-            return []
+                logger.warning("Could not create library folder: %s", e)
+            return [], []
+        
+        global _LIBRARY_CACHE
+        
+        # Reuse the previous scan if the folder contents haven't changed
+        try:
+            library_mtime = library_path.stat().st_mtime
+        except OSError:
+            library_mtime = None
+        
+        if _LIBRARY_CACHE is not None and _LIBRARY_CACHE[0] == library_mtime:
+            return list(_LIBRARY_CACHE[1]), list(_LIBRARY_CACHE[2])
         
         # Scan for PDF files
-        pdf_files = sorted(library_path.glob("*.pdf"))
+        pdf_files = sorted(
+            p for p in library_path.iterdir()
+            if p.suffix.lower() == '.pdf' and p.is_file()
+        )
         
         if not pdf_files:
-            print(f"No PDF templates found in: {library_path}")
-            return []
+            logger.warning("No PDF templates found in: %s", library_path)
+            return [], []
         
         # Convert to string paths
         file_paths = [str(f) for f in pdf_files]
-        print(f"Found {len(file_paths)} template(s) in library: {[os.path.basename(f) for f in file_paths]}")
+        file_names = [f.name for f in pdf_files]
+        logger.info("Found %d template(s) in library: %s", len(file_paths), file_names)
+        
+        if library_mtime is not None:
+            _LIBRARY_CACHE = (library_mtime, file_paths, file_names)
         
-        return file_paths
+        return list(file_paths), list(file_names)
     
     def _on_template_selected(self, selected_name: str) -> None:
         """
@@ -620,17 +816,16 @@ class PDFAutomationApp(ctk.CTk):
             selected_name: The filename selected in the dropdown
         """
         # Find the full path for the selected template
-        for file_path in self.template_files:
-            if os.path.basename(file_path) == selected_name:
-                self.template_path = file_path
-                print(f"Selected template: {file_path}")
-                break
+        file_path = self._template_by_basename.get(selected_name)
+        if file_path:
+            self.template_path = file_path
+            logger.debug("Selected template: %s", file_path)
     
     def _browse_output_folder(self) -> None:
         """Open folder browser dialog to select output destination"""
         folder_path = filedialog.askdirectory(
             title="Select Output Folder",
-            initialdir=self.output_path_entry.get() or os.path.expanduser('~')
+            initialdir=self.output_path_entry.get() or self._HOME_DIR
         )
         
         if folder_path:
@@ -640,7 +835,7 @@ class PDFAutomationApp(ctk.CTk):
             
             # Update the output folder variable
             self.output_folder = folder_path
-            print(f"Output folder set to: {folder_path}")
+            logger.debug("Output folder set to: %s", folder_path)
     
     def _check_library_and_warn(self) -> bool:
         """
@@ -665,6 +860,53 @@ class PDFAutomationApp(ctk.CTk):
     
     # ==================== Navigation Methods ====================
     
+    def _cached_page_count(self, file_path: str) -> int:
+        """
+        Get the page count of a PDF file, reusing a cached value if the file
+        has not been modified since it was last counted.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Returns:
+            Number of pages in the PDF, or 0 if error
+        """
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            with self._page_count_lock:
+                return get_page_count(file_path)
+        
+        cached = self._page_count_cache.get(file_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        # PyMuPDF is not thread-safe; don't count on two threads at once
+        with self._page_count_lock:
+            # Another thread may have counted this file while we waited
+            cached = self._page_count_cache.get(file_path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            
+            page_count = get_page_count(file_path)
+            self._page_count_cache[file_path] = (mtime, page_count)
+        return page_count
+    
+    def _prefetch_page_counts(self, file_paths: List[str], generation: int) -> None:
+        """
+        Populate the page count cache for the given files (runs in separate thread).
+        
+        Stops early once a newer selection has been made.
+        
+        Args:
+            file_paths: Paths of the files to count
+            generation: Value of _selection_generation when the files were selected
+        """
+        for file_path in file_paths:
+            if generation != self._selection_generation:
+                return
+            self._cached_page_count(file_path)
+    
     def _update_navigation_ui(self) -> None:
         """Update navigation labels and button states based on current indices"""
         total_files = len(self.selected_files)
@@ -707,45 +949,156 @@ class PDFAutomationApp(ctk.CTk):
         
         # Show loading message
         self._show_canvas_message("Loading preview...")
-        self.update()
+        self.preview_canvas.update_idletasks()
         
-        # Load preview in a separate thread
-        threading.Thread(
-            target=self._generate_and_display_preview_page,
-            args=(file_path, self.current_page_index),
+        # Supersede any earlier request and restart the debounce timer
+        self._preview_req_id += 1
+        if self._pending_preview_after is not None:
+            self.after_cancel(self._pending_preview_after)
+        
+        # Hand the request to the preview worker once navigation settles
+        self._pending_preview_after = self.after(
+            PREVIEW_DEBOUNCE_MS,
+            self._submit_preview_request,
+            file_path,
+            self.current_page_index,
+            self._adjacent_pages(),
+            self._preview_req_id
+        )
+    
+    def _submit_preview_request(
+        self,
+        file_path: str,
+        page_number: int,
+        prefetch_pages: List[Tuple[str, int]],
+        request_id: int
+    ) -> None:
+        """Queue a debounced preview request, replacing any that hasn't started yet"""
+        self._pending_preview_after = None
+        
+        try:
+            self._preview_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._preview_queue.put_nowait((file_path, page_number, prefetch_pages, request_id))
+    
+    def _preview_worker(self) -> None:
+        """Render queued preview requests one at a time (runs in separate thread)"""
+        while True:
+            file_path, page_number, prefetch_pages, request_id = self._preview_queue.get()
+            
+            # Skip requests superseded while waiting in the queue
+            if self._is_stale_preview(request_id):
+                continue
+            
+            self._generate_and_display_preview_page(file_path, page_number, prefetch_pages, request_id)
+    
+    def _adjacent_pages(self) -> List[Tuple[str, int]]:
+        """
+        Get the pages the user is likely to navigate to next.
+        
+        Returns:
+            List of (file path, page index) tuples: the next and previous page
+            of the current file, and the first page of the next file.
+        """
+        file_path = self.selected_files[self.current_file_index]
+        pages = []
+        
+        if self.current_page_index + 1 < self.current_file_page_count:
+            pages.append((file_path, self.current_page_index + 1))
+        if self.current_page_index > 0:
+            pages.append((file_path, self.current_page_index - 1))
+        if self.current_file_index + 1 < len(self.selected_files):
+            pages.append((self.selected_files[self.current_file_index + 1], 0))
+        
+        return pages
+    
+    def _start_preview_process(self) -> None:
+        """Start (or restart) the preview render process and its pipe"""
+        self._preview_conn, child_conn = multiprocessing.Pipe()
+        self._preview_process = multiprocessing.Process(
+            target=preview_render_loop,
+            args=(child_conn,),
             daemon=True
-        ).start()
+        )
+        self._preview_process.start()
+        
+        # Close our copy of the child end so a dead process is seen as EOF
+        child_conn.close()
+    
+    def _render_preview(
+        self,
+        file_path: str,
+        max_size: Tuple[int, int],
+        page_number: int,
+        prefetch_pages: List[Tuple[str, int]]
+    ) -> Optional[Image.Image]:
+        """
+        Render a preview image in the preview process.
+        
+        Only called from the preview worker thread, which owns the pipe. The
+        render process also prefetches the given pages into its cache.
+        
+        Args:
+            file_path: Path to the PDF file
+            max_size: Tuple of (max_width, max_height) for the preview area
+            page_number: Which page to render (0-indexed)
+            prefetch_pages: (file path, page index) tuples to render ahead
+            
+        Returns:
+            PIL Image object or None if error
+        """
+        try:
+            self._preview_conn.send((file_path, max_size, page_number, prefetch_pages))
+            size, data = self._preview_conn.recv()
+        except (EOFError, OSError) as e:
+            # The render process died (e.g. crashed on a malformed PDF)
+            logger.error("Preview process stopped unexpectedly: %s", e)
+            self._start_preview_process()
+            return None
+        
+        if size is None:
+            return None
+        
+        return Image.frombytes("RGB", size, data)
     
-    def _generate_and_display_preview_page(self, file_path: str, page_number: int) -> None:
+    def _generate_and_display_preview_page(
+        self,
+        file_path: str,
+        page_number: int,
+        prefetch_pages: Optional[List[Tuple[str, int]]] = None,
+        request_id: Optional[int] = None
+    ) -> None:
         """Generate preview for a specific page and update GUI (runs in separate thread)"""
         try:
-            # Get preview area dimensions
-            self.preview_canvas.update_idletasks()
-            width = self.preview_canvas.winfo_width()
-            height = self.preview_canvas.winfo_height()
-            
-            if width <= 1:
-                width = 800
-            if height <= 1:
-                height = 600
+            # Get preview area dimensions (tracked by _on_canvas_configure, so
+            # no Tk calls are made from this thread)
+            width = self._canvas_w
+            height = self._canvas_h
             
             padding = 40
-            max_width = max(width - padding, 400)
-            max_height = max(height - padding, 300)
+            max_width = min(max(width - padding, 400), PREVIEW_MAX_RENDER_SIZE[0])
+            max_height = min(max(height - padding, 300), PREVIEW_MAX_RENDER_SIZE[1])
             
-            # Generate preview image for specific page
-            pil_image = generate_preview_image(file_path, (max_width, max_height), page_number=page_number)
+            # Generate preview image for specific page (neighbouring pages are
+            # rendered ahead in the background so navigation is instant)
+            pil_image = self._render_preview(
+                file_path,
+                (max_width, max_height),
+                page_number,
+                prefetch_pages or []
+            )
             
             if pil_image is None:
-                self.after(0, self._show_preview_error, "Failed to generate preview image")
+                self.after(0, self._show_preview_error, "Failed to generate preview image", request_id)
                 return
             
             # Update GUI in main thread
-            self.after(0, self._display_preview, pil_image, os.path.basename(file_path))
+            self.after(0, self._display_preview, pil_image, os.path.basename(file_path), request_id)
             
         except Exception as e:
             error_msg = f"Error loading PDF page: {str(e)}"
-            self.after(0, self._show_preview_error, error_msg)
+            self.after(0, self._show_preview_error, error_msg, request_id)
     
     def _prev_file(self) -> None:
         """Navigate to previous file"""
@@ -754,7 +1107,7 @@ class PDFAutomationApp(ctk.CTk):
             self.current_page_index = 0  # Reset to first page
             
             # Update page count for new file
-            self.current_file_page_count = get_page_count(self.selected_files[self.current_file_index])
+            self.current_file_page_count = self._cached_page_count(self.selected_files[self.current_file_index])
             
             # Update UI and load preview
             self._update_navigation_ui()
@@ -767,7 +1120,7 @@ class PDFAutomationApp(ctk.CTk):
             self.current_page_index = 0  # Reset to first page
             
             # Update page count for new file
-            self.current_file_page_count = get_page_count(self.selected_files[self.current_file_index])
+            self.current_file_page_count = self._cached_page_count(self.selected_files[self.current_file_index])
             
             # Update UI and load preview
             self._update_navigation_ui()
@@ -798,121 +1151,85 @@ class PDFAutomationApp(ctk.CTk):
             self.after(0, self._show_preview_error, str(e))
     
     def _get_preview_size_and_load(self, file_path: str) -> None:
-        """Get preview area dimensions and trigger preview loading"""
-        # Get actual dimensions of preview canvas
-        self.preview_canvas.update_idletasks()
-        width = self.preview_canvas.winfo_width()
-        height = self.preview_canvas.winfo_height()
-        
-        # Use default size if dimensions aren't available yet
-        if width <= 1:
-            width = 800
-        if height <= 1:
-            height = 600
-        
-        # The border is handled inside generate_preview_image, so we pass the full available size
-        # Small padding to ensure image doesn't touch edges
-        padding = 40
-        max_width = max(width - padding, 400)
-        max_height = max(height - padding, 300)
-        
-        # Start loading in thread
-        threading.Thread(
-            target=self._generate_and_display_preview,
-            args=(file_path, (max_width, max_height)),
-            daemon=True
-        ).start()
+        """Queue a first-page preview of a file on the preview worker"""
+        # Supersede any earlier request, including a pending debounced one
+        self._preview_req_id += 1
+        if self._pending_preview_after is not None:
+            self.after_cancel(self._pending_preview_after)
+        
+        # The worker reads the canvas size itself and renders to fit it
+        self._submit_preview_request(file_path, 0, [], self._preview_req_id)
     
-    def _generate_and_display_preview(self, file_path: str, max_size: Tuple[int, int]) -> None:
-        """Generate preview image and update GUI (runs in separate thread)"""
-        try:
-            # Generate preview image
-            pil_image = generate_preview_image(file_path, max_size)
-            
-            if pil_image is None:
-                self.after(0, self._show_preview_error, "Failed to generate preview image")
-                return
-            
-            # Update GUI in main thread with the PIL image
-            self.after(0, self._display_preview, pil_image, os.path.basename(file_path))
-            
-        except Exception as e:
-            error_msg = f"Error loading PDF: {str(e)}"
-            self.after(0, self._show_preview_error, error_msg)
+    def _is_stale_preview(self, request_id: Optional[int]) -> bool:
+        """Check whether a preview result belongs to a superseded request"""
+        return request_id is not None and request_id != self._preview_req_id
     
-    def _display_preview(self, pil_image: Image.Image, filename: str) -> None:
+    def _display_preview(self, pil_image: Image.Image, filename: str, request_id: Optional[int] = None) -> None:
         """Display the preview image centered on canvas (called in main thread)"""
+        # Drop results for requests the user has already navigated away from
+        if self._is_stale_preview(request_id):
+            return
+        
         try:
-            # Convert PIL Image to PhotoImage for canvas
-            self._photo_image = ImageTk.PhotoImage(pil_image)
-            
-            # Clear the canvas
-            self.preview_canvas.delete("all")
-            
-            # Get canvas dimensions
-            canvas_width = self.preview_canvas.winfo_width()
-            canvas_height = self.preview_canvas.winfo_height()
+            # Convert PIL Image to PhotoImage for canvas, reusing the existing
+            # PhotoImage when the size is unchanged to avoid reallocating it
+            if self._photo_image is not None and (
+                (self._photo_image.width(), self._photo_image.height()) == pil_image.size
+            ):
+                self._photo_image.paste(pil_image)
+            else:
+                self._photo_image = ImageTk.PhotoImage(pil_image)
             
-            # Calculate center position
-            x = canvas_width // 2
-            y = canvas_height // 2
+            # Calculate center position (canvas size tracked by _on_canvas_configure)
+            x = self._canvas_w // 2
+            y = self._canvas_h // 2
             
-            # Place image centered on canvas
-            self._canvas_image_id = self.preview_canvas.create_image(
-                x, y,
-                image=self._photo_image,
-                anchor="center"
-            )
+            # Show the image centered on canvas and hide any message
+            self.preview_canvas.itemconfigure(self._canvas_text_id, state="hidden")
+            self.preview_canvas.itemconfigure(self._canvas_image_id, image=self._photo_image, state="normal")
+            self.preview_canvas.coords(self._canvas_image_id, x, y)
             
-            print(f"Preview loaded: {filename} (size: {pil_image.size})")
+            logger.debug("Preview loaded: %s (size: %s)", filename, pil_image.size)
             
         except Exception as e:
             self._show_preview_error(f"Error displaying preview: {str(e)}")
     
     def _show_canvas_message(self, message: str, color: str = "#FFFFFF") -> None:
         """Display a text message centered on the canvas"""
-        self.preview_canvas.delete("all")
-        
-        # Get canvas dimensions (use defaults if not yet rendered)
-        canvas_width = self.preview_canvas.winfo_width()
-        canvas_height = self.preview_canvas.winfo_height()
-        
-        if canvas_width <= 1:
-            canvas_width = 400
-        if canvas_height <= 1:
-            canvas_height = 300
-        
-        # Create centered text
-        x = canvas_width // 2
-        y = canvas_height // 2
-        
-        self._canvas_text_id = self.preview_canvas.create_text(
-            x, y,
-            text=message,
-            fill=color,
-            font=("Arial", 14),
-            anchor="center"
-        )
+        # Show centered text and hide any image (canvas size tracked by
+        # _on_canvas_configure, with defaults until the canvas is first shown)
+        x = self._canvas_w // 2
+        y = self._canvas_h // 2
+        
+        self.preview_canvas.itemconfigure(self._canvas_image_id, state="hidden")
+        self.preview_canvas.itemconfigure(self._canvas_text_id, text=message, fill=color, state="normal")
+        self.preview_canvas.coords(self._canvas_text_id, x, y)
     
     def _on_canvas_configure(self, event=None) -> None:
         """Handle canvas resize - recenter the image if one is loaded"""
-        if self._photo_image and self._canvas_image_id:
-            # Recenter the image when canvas is resized
-            canvas_width = self.preview_canvas.winfo_width()
-            canvas_height = self.preview_canvas.winfo_height()
-            x = canvas_width // 2
-            y = canvas_height // 2
-            self.preview_canvas.coords(self._canvas_image_id, x, y)
-        elif self._canvas_text_id:
-            # Recenter text message
-            canvas_width = self.preview_canvas.winfo_width()
-            canvas_height = self.preview_canvas.winfo_height()
-            x = canvas_width // 2
-            y = canvas_height // 2
-            self.preview_canvas.coords(self._canvas_text_id, x, y)
+        if event is not None and event.width > 1 and event.height > 1:
+            self._canvas_w, self._canvas_h = event.width, event.height
+        
+        # Only recenter once resizing pauses, not on every pixel of a drag
+        if self._resize_after_id is not None:
+            self.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.after(50, self._do_recenter)
     
-    def _show_preview_error(self, error_message: str) -> None:
+    def _do_recenter(self) -> None:
+        """Recenter the image or message on the canvas after a resize"""
+        self._resize_after_id = None
+        
+        # Recenter both items (the hidden one is simply moved along)
+        x = self._canvas_w // 2
+        y = self._canvas_h // 2
+        self.preview_canvas.coords(self._canvas_image_id, x, y)
+        self.preview_canvas.coords(self._canvas_text_id, x, y)
+    
+    def _show_preview_error(self, error_message: str, request_id: Optional[int] = None) -> None:
         """Show error message in preview area and popup"""
+        if self._is_stale_preview(request_id):
+            return
+        
         try:
             # Show error in preview area
             self._show_canvas_message(f"Error: {error_message}", color="#FF6B6B")
@@ -920,13 +1237,20 @@ class PDFAutomationApp(ctk.CTk):
             # Show error popup
             messagebox.showerror("PDF Preview Error", error_message)
             
-            print(f"Preview error: {error_message}")
+            logger.error("Preview error: %s", error_message)
             
         except Exception as e:
-            print(f"Error showing error message: {e}")
+            logger.error("Error showing error message: %s", e)
+    
+    def _schedule_project_update(self, event=None) -> None:
+        """Update project data once typing pauses instead of on every keystroke"""
+        if self._project_data_after is not None:
+            self.after_cancel(self._project_data_after)
+        self._project_data_after = self.after(150, self.update_project_data)
     
     def update_project_data(self, event=None) -> None:
         """Update project data dictionary when inputs change"""
+        self._project_data_after = None
         self.project_data['project_name'] = self.project_name_entry.get()
         self.project_data['client_name'] = self.client_name_entry.get()
         self.project_data['date'] = self.date_entry.get()
@@ -949,90 +1273,151 @@ class PDFAutomationApp(ctk.CTk):
         
         # Get currently selected template from dropdown
         selected_template_name = self.template_dropdown.get()
-        for file_path in self.template_files:
-            if os.path.basename(file_path) == selected_template_name:
-                self.template_path = file_path
-                break
+        template_path = self._template_by_basename.get(selected_template_name)
+        if template_path:
+            self.template_path = template_path
         
         # Update project data from entries
         self.update_project_data()
         
+        # Parse excluded pages from the input field (memoized for repeat batches)
+        excluded_pages = parse_page_range(self.exclude_pages_entry.get())
+        
+        # Get output folder from entry field (allows manual paste or browse selection)
+        output_folder_str = self.output_path_entry.get().strip()
+        if not output_folder_str:
+            # Fallback to default if empty
+            output_folder_str = os.path.join(self._HOME_DIR, 'Desktop', 'Leviat_Output')
+        
         # Disable the button during processing
         self.save_export_btn.configure(state="disabled")
         
-        # Run batch processing in a separate thread to keep GUI responsive
+        # Run batch processing in a separate thread to keep GUI responsive.
+        # All widget values are read here, on the main thread, and handed over
+        # as plain values so the batch thread never touches Tk.
         threading.Thread(
             target=self._batch_process_files,
+            args=(
+                list(self.selected_files),
+                self.template_path,
+                excluded_pages,
+                output_folder_str,
+                dict(self.project_data),
+                bool(self.clean_contents_var.get())
+            ),
             daemon=True
         ).start()
     
-    def _batch_process_files(self) -> None:
+    def _batch_process_files(
+        self,
+        file_paths: List[str],
+        template_path: str,
+        excluded_pages: Set[int],
+        output_folder_str: str,
+        project_data: dict,
+        clean_contents: bool
+    ) -> None:
         """Process all selected files in a batch (runs in separate thread)"""
-        total_files = len(self.selected_files)
+        total_files = len(file_paths)
         successful = 0
         failed = 0
-        failed_files = []
         
-        # Parse excluded pages from the input field
-        exclude_string = self.exclude_pages_entry.get()
-        excluded_pages = parse_page_range(exclude_string)
         if excluded_pages:
-            print(f"Excluding pages (0-indexed): {sorted(excluded_pages)}")
-        
-        # Get output folder from entry field (allows manual paste or browse selection)
-        output_folder_str = self.output_path_entry.get().strip()
-        if not output_folder_str:
-            # Fallback to default if empty
-            output_folder_str = os.path.join(os.path.expanduser('~'), 'Desktop', 'Leviat_Output')
+            logger.info("Excluding pages (0-indexed): %s", sorted(excluded_pages))
         
         # Create output folder if it doesn't exist
         output_folder_path = Path(output_folder_str)
         output_folder_path.mkdir(parents=True, exist_ok=True)
-        print(f"Output folder: {output_folder_path}")
+        logger.info("Output folder: %s", output_folder_path)
         
         # Show progress bar and status label
-        self.after(0, self._show_progress_bar)
+        self._after_from_batch(0, self._show_progress_bar)
+        self._after_from_batch(0, self._update_progress, 0.0, f"Processing {total_files} file(s)...")
         
-        for i, file_path in enumerate(self.selected_files, start=1):
-            filename = os.path.basename(file_path)
+        # Read the template once; each worker process opens it a single time
+        try:
+            template_bytes = Path(template_path).read_bytes()
+        except OSError as e:
+            logger.error("Could not read template %s: %s", template_path, e)
+            template_bytes = None
+        
+        # Files are independent, so process them in parallel across CPU cores
+        results = {}
+        max_workers = min(os.cpu_count() or 1, total_files)
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_batch_worker if template_bytes is not None else None,
+            initargs=(template_bytes,) if template_bytes is not None else ()
+        )
+        self._batch_executor = executor
+        try:
+            if self._closing:
+                return
             
-            # Update progress bar and status
-            progress_value = (i - 1) / total_files
-            status_text = f"Processing file {i}/{total_files}: {filename}..."
-            self.after(0, self._update_progress, progress_value, status_text)
+            futures = {
+                executor.submit(
+                    _process_one,
+                    file_path,
+                    template_path,
+                    str(output_folder_path),
+                    project_data,
+                    excluded_pages,
+                    clean_contents
+                ): index
+                for index, file_path in enumerate(file_paths)
+            }
             
-            try:
-                # Process the PDF file
-                output_filename = f"processed_{filename}"
-                file_output_path = output_folder_path / output_filename
+            for completed, future in enumerate(as_completed(futures), start=1):
+                if self._closing:
+                    # The window was closed; _on_close cancelled the rest
+                    return
                 
-                # Call pdf_logic.process_with_margins for the file
-                pdf_logic.process_with_margins(
-                    input_path=file_path,
-                    template_path=self.template_path,
-                    output_path=str(file_output_path),
-                    project_data=self.project_data,
-                    excluded_pages=excluded_pages
-                )
+                index = futures[future]
+                try:
+                    filename, ok, error = future.result()
+                except Exception as e:
+                    # The worker process itself failed (e.g. crashed)
+                    filename = os.path.basename(file_paths[index])
+                    ok, error = False, str(e)
+                results[index] = (filename, ok, error)
                 
-                successful += 1
-                print(f"Successfully processed: {filename}")
+                if ok:
+                    successful += 1
+                    logger.info("Successfully processed: %s", filename)
+                else:
+                    # Log error but continue with other files
+                    failed += 1
+                    logger.error("Error processing %s: %s", filename, error)
                 
-            except Exception as e:
-                # Log error but continue with other files
-                failed += 1
-                failed_files.append(filename)
-                print(f"Error processing {filename}: {str(e)}")
+                # Update progress bar and status
+                status_text = f"Processed file {completed}/{total_files}: {filename}"
+                self._after_from_batch(0, self._update_progress, completed / total_files, status_text)
+        finally:
+            self._batch_executor = None
+            executor.shutdown(wait=not self._closing, cancel_futures=self._closing)
+        
+        # Report failures in selection order
+        failed_files = [results[i][0] for i in sorted(results) if not results[i][1]]
         
         # Update progress to 100%
-        self.after(0, self._update_progress, 1.0, "Batch processing complete!")
+        self._after_from_batch(0, self._update_progress, 1.0, "Batch processing complete!")
         
         # Hide progress bar and show completion message
-        self.after(500, self._hide_progress_bar)
-        self.after(600, self._show_batch_complete_message, successful, failed, failed_files, str(output_folder_path))
+        self._after_from_batch(500, self._hide_progress_bar)
+        self._after_from_batch(600, self._show_batch_complete_message, successful, failed, failed_files, str(output_folder_path))
         
         # Re-enable the button
-        self.after(0, lambda: self.save_export_btn.configure(state="normal"))
+        self._after_from_batch(0, lambda: self.save_export_btn.configure(state="normal"))
+    
+    def _after_from_batch(self, delay_ms: int, callback, *args) -> None:
+        """Schedule a UI update from the batch thread, unless the app is closing"""
+        if self._closing:
+            return
+        try:
+            self.after(delay_ms, callback, *args)
+        except (RuntimeError, tk.TclError):
+            # The window was destroyed between the check and the call
+            pass
     
     def _show_progress_bar(self) -> None:
         """Show the progress bar and status label"""
@@ -1072,10 +1457,16 @@ class PDFAutomationApp(ctk.CTk):
 
 def main():
     """Application entry point"""
+    # Set LEVIAT_LOG=DEBUG (or INFO) for verbose console output
+    log_level = getattr(logging, os.environ.get('LEVIAT_LOG', 'WARNING').upper(), logging.WARNING)
+    logging.basicConfig(level=log_level, format="%(levelname)s %(name)s: %(message)s")
+    
     app = PDFAutomationApp()
     app.mainloop()
 
 
 if __name__ == "__main__":
+    # Needed for the batch worker processes in frozen Windows builds
+    multiprocessing.freeze_support()
     main()
 
@@ -4,10 +4,14 @@ Handles resizing customer drawings and overlaying title block templates
 """
 
 import fitz  # PyMuPDF
+import logging
+import os
 from pathlib import Path
-from typing import Optional, Set
+from typing import Optional, Set, Union
 
 
+logger = logging.getLogger(__name__)
+
 # A3 Landscape dimensions in points (1 inch = 72 pts, 1 mm = 2.834645 pts)
 A3_WIDTH_PTS = 1191  # 420mm
 A3_HEIGHT_PTS = 842  # 297mm
@@ -25,6 +29,23 @@ BOTTOM_MARGIN_PTS = BOTTOM_MARGIN_MM * MM_TO_PTS  # ~85 pts
 LEFT_MARGIN_PTS = LEFT_MARGIN_MM * MM_TO_PTS     # ~57 pts
 RIGHT_MARGIN_PTS = RIGHT_MARGIN_MM * MM_TO_PTS   # ~57 pts
 
+# Page geometry as rectangles (treat as read-only)
+A3_RECT = fitz.Rect(0, 0, A3_WIDTH_PTS, A3_HEIGHT_PTS)
+SAFE_ZONE = fitz.Rect(
+    LEFT_MARGIN_PTS,
+    TOP_MARGIN_PTS,
+    A3_WIDTH_PTS - RIGHT_MARGIN_PTS,
+    A3_HEIGHT_PTS - BOTTOM_MARGIN_PTS
+)
+
+# Output save options: compact the xref and compress streams for smaller files
+SAVE_OPTIONS = {
+    "garbage": 4,
+    "deflate": True,
+    "deflate_images": True,
+    "deflate_fonts": True,
+}
+
 
 def get_safe_zone_rect() -> fitz.Rect:
     """
@@ -34,14 +55,86 @@ def get_safe_zone_rect() -> fitz.Rect:
     drawing will be placed, accounting for margins around the title block.
     
     Returns:
-        fitz.Rect: The safe zone rectangle in points
+        fitz.Rect: A copy of SAFE_ZONE (the safe zone rectangle in points)
+    """
+    return fitz.Rect(SAFE_ZONE)
+
+
+def _save_output(output_doc: fitz.Document, output_path: str) -> None:
+    """
+    Save the output document atomically.
+    
+    The PDF is written to "<output_path>.part" and then renamed over
+    output_path, so readers never see a partially written file.
+    
+    Args:
+        output_doc: The composed output document
+        output_path: Path where the processed PDF will be saved
+    """
+    temp_path = f"{output_path}.part"
+    try:
+        output_doc.save(temp_path, **SAVE_OPTIONS)
+        os.replace(temp_path, output_path)
+    except Exception:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def _show_source_page(
+    output_page: fitz.Page,
+    target_rect: fitz.Rect,
+    source_doc: fitz.Document,
+    page_num: int,
+    clean_contents: bool = False
+) -> None:
+    """
+    Place a source page into target_rect on the output page.
+    
+    The source page's content stream is only cleaned/flattened when requested,
+    or as a retry if placing the uncleaned page fails.
+    
+    Args:
+        output_page: Page to draw onto
+        target_rect: Rectangle on output_page to fit the source page into
+        source_doc: Document containing the source page
+        page_num: Page number in source_doc (0-indexed)
+        clean_contents: Always clean the source page before placing it
+    """
+    source_page = source_doc[page_num]
+    if clean_contents:
+        source_page.clean_contents()
+    
+    try:
+        # keep_proportion=True ensures aspect ratio is maintained
+        output_page.show_pdf_page(target_rect, source_doc, page_num, keep_proportion=True)
+    except Exception:
+        if clean_contents:
+            raise
+        # Some malformed content streams can only be placed after cleaning
+        source_page.clean_contents()
+        output_page.show_pdf_page(target_rect, source_doc, page_num, keep_proportion=True)
+
+
+def open_template(template: Union[str, bytes]) -> fitz.Document:
+    """
+    Open a title block template PDF for reuse across several files.
+    
+    Args:
+        template: Path to the template PDF, or its raw bytes
+        
+    Returns:
+        fitz.Document: The opened template (the caller is responsible for closing it)
+        
+    Raises:
+        FileNotFoundError: If the template path doesn't exist
     """
-    x0 = LEFT_MARGIN_PTS
-    y0 = TOP_MARGIN_PTS
-    x1 = A3_WIDTH_PTS - RIGHT_MARGIN_PTS
-    y1 = A3_HEIGHT_PTS - BOTTOM_MARGIN_PTS
+    if isinstance(template, bytes):
+        return fitz.open(stream=template, filetype="pdf")
+    
+    if not Path(template).exists():
+        raise FileNotFoundError(f"Template PDF not found: {template}")
     
-    return fitz.Rect(x0, y0, x1, y1)
+    return fitz.open(template)
 
 
 def process_with_margins(
@@ -49,7 +142,9 @@ def process_with_margins(
     template_path: str,
     output_path: str,
     project_data: Optional[dict] = None,
-    excluded_pages: Optional[Set[int]] = None
+    excluded_pages: Optional[Set[int]] = None,
+    template_doc: Optional[fitz.Document] = None,
+    clean_contents: bool = False
 ) -> None:
     """
     Process a customer PDF by resizing it to fit within A3 safe zone
@@ -63,6 +158,11 @@ def process_with_margins(
                       (project_name, client_name, date, drawn_by)
         excluded_pages: Optional set of 0-based page indices to exclude
                         from processing (e.g., {0, 2, 3} skips pages 1, 3, 4)
+        template_doc: Optional already-opened template (see open_template).
+                      When given, template_path is not reopened and the
+                      document is left open for the caller to reuse.
+        clean_contents: Clean/flatten each source page's content stream before
+                        placing it (slow; otherwise only done if placing fails)
     
     Raises:
         FileNotFoundError: If input or template file doesn't exist
@@ -76,51 +176,39 @@ def process_with_margins(
     if not Path(input_path).exists():
         raise FileNotFoundError(f"Input PDF not found: {input_path}")
     
-    if not Path(template_path).exists():
-        raise FileNotFoundError(f"Template PDF not found: {template_path}")
-    
-    # Open source documents
+    # Open source documents (reusing the caller's template if provided)
+    owns_template = template_doc is None
+    if owns_template:
+        template_doc = open_template(template_path)
     source_doc = fitz.open(input_path)
-    template_doc = fitz.open(template_path)
     
     # Create output document
     output_doc = fitz.open()
     
-    # Define the full A3 landscape page rect
-    a3_rect = fitz.Rect(0, 0, A3_WIDTH_PTS, A3_HEIGHT_PTS)
-    
-    # Get the safe zone for customer drawings
-    safe_zone = get_safe_zone_rect()
-    
     # Calculate pages to process
     total_pages = source_doc.page_count
     pages_to_process = [p for p in range(total_pages) if p not in excluded_pages]
     
-    print(f"Processing {len(pages_to_process)}/{total_pages} page(s) from: {input_path}")
+    logger.debug("Processing %d/%d page(s) from: %s", len(pages_to_process), total_pages, input_path)
     if excluded_pages:
         excluded_display = [p + 1 for p in sorted(excluded_pages) if p < total_pages]
         if excluded_display:
-            print(f"  Excluding pages: {excluded_display}")
-    print(f"A3 Dimensions: {A3_WIDTH_PTS} x {A3_HEIGHT_PTS} pts")
-    print(f"Safe Zone: {safe_zone}")
+            logger.debug("  Excluding pages: %s", excluded_display)
+    logger.debug("A3 Dimensions: %s x %s pts", A3_WIDTH_PTS, A3_HEIGHT_PTS)
+    logger.debug("Safe Zone: %s", SAFE_ZONE)
     
     try:
-        # Process each page of the input PDF (except excluded ones)
-        processed_count = 0
-        for page_num in range(source_doc.page_count):
-            # Skip excluded pages
-            if page_num in excluded_pages:
-                print(f"  Skipping page {page_num + 1} (excluded)")
-                continue
-            
-            processed_count += 1
-            
-            # Get the source page
-            source_page = source_doc[page_num]
-            
-            # Clean/flatten the source page contents
-            source_page.clean_contents()
-            
+        # PyMuPDF imports the template page as a Form XObject on first use and
+        # reuses that xref for every later page of this output document, so
+        # each overlay below only adds a reference to it
+        has_template = template_doc.page_count > 0
+        
+        # Process each page of the input PDF (excluded ones were filtered out above).
+        # Pages are composed sequentially on purpose: PyMuPDF is not thread-safe
+        # and holds the GIL while working, so threads would not speed this up.
+        # Parallelism comes from processing separate files in separate processes.
+        processed_count = len(pages_to_process)
+        for output_page_num, page_num in enumerate(pages_to_process, start=1):
             # Create a new blank A3 landscape page in output
             output_page = output_doc.new_page(
                 width=A3_WIDTH_PTS,
@@ -128,29 +216,23 @@ def process_with_margins(
             )
             
             # Place the customer drawing within the Safe Zone
-            # keep_proportion=True ensures aspect ratio is maintained
-            output_page.show_pdf_page(
-                safe_zone,                   # Target rectangle (safe zone)
-                source_doc,                  # Source document
-                page_num,                    # Page number from source
-                keep_proportion=True         # Maintain aspect ratio
-            )
+            _show_source_page(output_page, SAFE_ZONE, source_doc, page_num, clean_contents)
             
             # Overlay the title block template on top (full A3 rect)
             # The template should have transparency where the drawing shows through
-            if template_doc.page_count > 0:
+            if has_template:
                 output_page.show_pdf_page(
-                    a3_rect,                 # Full page rect
+                    A3_RECT,                 # Full page rect
                     template_doc,            # Template document
                     0,                       # First page of template
                     keep_proportion=True     # Maintain aspect ratio
                 )
             
-            print(f"  Processed page {page_num + 1}/{source_doc.page_count} -> output page {processed_count}")
+            logger.debug("  Processed page %d/%d -> output page %d", page_num + 1, total_pages, output_page_num)
         
         # Check if any pages were processed
         if processed_count == 0:
-            print(f"  Warning: All pages were excluded. No output generated.")
+            logger.warning("All pages of %s were excluded. No output generated.", input_path)
             return
         
         # Ensure output directory exists
@@ -158,13 +240,14 @@ def process_with_margins(
         output_dir.mkdir(parents=True, exist_ok=True)
         
         # Save the output document
-        output_doc.save(output_path)
-        print(f"Saved output to: {output_path} ({processed_count} pages)")
+        _save_output(output_doc, output_path)
+        logger.info("Saved output to: %s (%d pages)", output_path, processed_count)
         
     finally:
         # Close all documents
         source_doc.close()
-        template_doc.close()
+        if owns_template:
+            template_doc.close()
         output_doc.close()
 
 
@@ -172,7 +255,8 @@ def process_single_page(
     input_path: str,
     template_path: str,
     output_path: str,
-    page_number: int = 0
+    page_number: int = 0,
+    clean_contents: bool = False
 ) -> None:
     """
     Process a single page from a customer PDF.
@@ -182,6 +266,8 @@ def process_single_page(
         template_path: Path to the title block template PDF
         output_path: Path where the processed PDF will be saved
         page_number: Which page to process (0-indexed)
+        clean_contents: Clean/flatten the source page's content stream before
+                        placing it (otherwise only done if placing fails)
     """
     source_doc = fitz.open(input_path)
     
@@ -192,35 +278,24 @@ def process_single_page(
     template_doc = fitz.open(template_path)
     output_doc = fitz.open()
     
-    a3_rect = fitz.Rect(0, 0, A3_WIDTH_PTS, A3_HEIGHT_PTS)
-    safe_zone = get_safe_zone_rect()
-    
     try:
-        source_page = source_doc[page_number]
-        source_page.clean_contents()
-        
         output_page = output_doc.new_page(
             width=A3_WIDTH_PTS,
             height=A3_HEIGHT_PTS
         )
         
-        output_page.show_pdf_page(
-            safe_zone,
-            source_doc,
-            page_number,
-            keep_proportion=True
-        )
+        _show_source_page(output_page, SAFE_ZONE, source_doc, page_number, clean_contents)
         
         if template_doc.page_count > 0:
             output_page.show_pdf_page(
-                a3_rect,
+                A3_RECT,
                 template_doc,
                 0,
                 keep_proportion=True
             )
         
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        output_doc.save(output_path)
+        _save_output(output_doc, output_path)
         
     finally:
         source_doc.close()
@@ -233,6 +308,8 @@ if __name__ == "__main__":
     import sys
     
     if len(sys.argv) >= 4:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        
         input_file = sys.argv[1]
         template_file = sys.argv[2]
         output_file = sys.argv[3]
@@ -245,7 +322,7 @@ if __name__ == "__main__":
         print("  2. Overlaying a title block template")
         print(f"\nGeometry:")
         print(f"  A3 Landscape: {A3_WIDTH_PTS} x {A3_HEIGHT_PTS} pts")
-        print(f"  Safe Zone: {get_safe_zone_rect()}")
+        print(f"  Safe Zone: {SAFE_ZONE}")
         print(f"  Top Margin: {TOP_MARGIN_MM}mm ({TOP_MARGIN_PTS:.1f} pts)")
         print(f"  Bottom Margin: {BOTTOM_MARGIN_MM}mm ({BOTTOM_MARGIN_PTS:.1f} pts)")
         print(f"  Left/Right Margins: {LEFT_MARGIN_MM}mm ({LEFT_MARGIN_PTS:.1f} pts)")
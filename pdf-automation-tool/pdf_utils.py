@@ -2,11 +2,100 @@
 PDF utility functions for preview and processing
 """
 
-from typing import Tuple, Optional
-from PIL import Image
+import hashlib
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Tuple, Optional
+from PIL import Image, ImageOps
 import fitz  # PyMuPDF
 
 
+logger = logging.getLogger(__name__)
+
+# Preview render zoom: oversample factor over the display size, and clamp range
+PREVIEW_OVERSAMPLE = 1.25
+PREVIEW_MIN_ZOOM = 0.25
+PREVIEW_MAX_ZOOM = 3.0
+
+# In-memory preview cache limits (least recently used entries are evicted)
+PREVIEW_CACHE_MAX_ENTRIES = 32
+PREVIEW_CACHE_MAX_PIXELS = 24_000_000  # ~72 MB of RGB data
+
+# On-disk preview cache (survives restarts; oldest files are pruned)
+PREVIEW_DISK_CACHE_DIR = Path.home() / ".cache" / "pdf-automation-tool"
+PREVIEW_DISK_CACHE_MAX_FILES = 256
+
+# Cache key: (absolute path, mtime_ns, max_size, page_number, border_size)
+_PREVIEW_CACHE: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+_preview_cache_pixels = 0
+_preview_cache_lock = threading.Lock()
+
+# Previews waiting to be written to the disk cache by the writer thread
+_disk_write_queue: "queue.Queue[Tuple[tuple, Image.Image]]" = queue.Queue()
+_disk_writer_started = False
+
+# Open documents kept for reuse by previews (least recently used are closed).
+# The render process closes them all once idle, since an open document keeps
+# a file handle that stops the file from being deleted or replaced on Windows.
+PDF_DOC_CACHE_MAX = 4
+PDF_DOC_CACHE_IDLE_SECONDS = 2.0
+
+# Cache key: (absolute path, mtime_ns). The lock is held while a document is in
+# use, since a fitz.Document must not be used from several threads at once.
+_DOC_CACHE: "OrderedDict[Tuple[str, int], fitz.Document]" = OrderedDict()
+_doc_cache_lock = threading.RLock()
+
+
+@contextmanager
+def open_pdf_cached(file_path: str) -> Iterator[fitz.Document]:
+    """
+    Open a PDF file, reusing a cached document if the file is unchanged.
+    
+    The document stays open after the with-block for later reuse; it is
+    closed when evicted from the cache. Callers must not close or modify it.
+    Access is serialized across threads for the duration of the with-block.
+    
+    Args:
+        file_path: Path to the PDF file
+        
+    Yields:
+        fitz.Document: The open document
+    """
+    path = os.path.abspath(file_path)
+    key = (path, os.stat(path).st_mtime_ns)
+    
+    with _doc_cache_lock:
+        doc = _DOC_CACHE.get(key)
+        if doc is not None:
+            _DOC_CACHE.move_to_end(key)
+        else:
+            doc = fitz.open(path)
+            
+            # Drop documents for older versions of the same file
+            for stale_key in [k for k in _DOC_CACHE if k[0] == path]:
+                _DOC_CACHE.pop(stale_key).close()
+            
+            _DOC_CACHE[key] = doc
+            while len(_DOC_CACHE) > PDF_DOC_CACHE_MAX:
+                _, evicted = _DOC_CACHE.popitem(last=False)
+                evicted.close()
+        
+        yield doc
+
+
+def close_cached_pdfs() -> None:
+    """Close all documents held open by open_pdf_cached"""
+    with _doc_cache_lock:
+        while _DOC_CACHE:
+            _, doc = _DOC_CACHE.popitem()
+            doc.close()
+
+
 def get_page_count(file_path: str) -> int:
     """
     Get the total number of pages in a PDF file.
@@ -23,10 +112,101 @@ def get_page_count(file_path: str) -> int:
         doc.close()
         return page_count
     except Exception as e:
-        print(f"Error getting page count: {e}")
+        logger.error("Error getting page count: %s", e)
         return 0
 
 
+def _preview_cache_get(key: tuple) -> Optional[Image.Image]:
+    """Look up a preview in the memory cache, then the disk cache"""
+    with _preview_cache_lock:
+        img = _PREVIEW_CACHE.get(key)
+        if img is not None:
+            _PREVIEW_CACHE.move_to_end(key)
+            return img
+    
+    cache_path = _preview_disk_cache_path(key)
+    if not cache_path.exists():
+        return None
+    
+    try:
+        with Image.open(cache_path) as cached:
+            cached.load()
+            img = cached.convert("RGB") if cached.mode != "RGB" else cached.copy()
+    except Exception as e:
+        logger.debug("Ignoring unreadable preview cache file %s: %s", cache_path, e)
+        return None
+    
+    _preview_cache_put_memory(key, img)
+    return img
+
+
+def _preview_cache_put(key: tuple, img: Image.Image) -> None:
+    """
+    Store a rendered preview in the memory cache and queue it for the disk cache.
+    
+    Encoding the PNG takes about as long as rendering the page, so the disk
+    write happens on a background thread instead of delaying the caller.
+    """
+    global _disk_writer_started
+    
+    _preview_cache_put_memory(key, img)
+    
+    with _preview_cache_lock:
+        if not _disk_writer_started:
+            threading.Thread(target=_preview_disk_writer, daemon=True).start()
+            _disk_writer_started = True
+    _disk_write_queue.put((key, img))
+
+
+def _preview_disk_writer() -> None:
+    """Write queued previews to the disk cache (runs in separate thread)"""
+    while True:
+        key, img = _disk_write_queue.get()
+        try:
+            PREVIEW_DISK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            img.save(_preview_disk_cache_path(key), "PNG", optimize=False, compress_level=1)
+            _prune_preview_disk_cache()
+        except Exception as e:
+            logger.debug("Could not write preview cache file: %s", e)
+
+
+def _preview_cache_put_memory(key: tuple, img: Image.Image) -> None:
+    """Insert into the in-memory LRU, evicting entries to stay within limits"""
+    global _preview_cache_pixels
+    
+    with _preview_cache_lock:
+        if key in _PREVIEW_CACHE:
+            _PREVIEW_CACHE.move_to_end(key)
+            return
+        
+        _PREVIEW_CACHE[key] = img
+        _preview_cache_pixels += img.width * img.height
+        
+        while len(_PREVIEW_CACHE) > 1 and (
+            len(_PREVIEW_CACHE) > PREVIEW_CACHE_MAX_ENTRIES
+            or _preview_cache_pixels > PREVIEW_CACHE_MAX_PIXELS
+        ):
+            _, evicted = _PREVIEW_CACHE.popitem(last=False)
+            _preview_cache_pixels -= evicted.width * evicted.height
+
+
+def _preview_disk_cache_path(key: tuple) -> Path:
+    """Get the on-disk cache file for a preview cache key"""
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+    return PREVIEW_DISK_CACHE_DIR / f"{digest}.png"
+
+
+def _prune_preview_disk_cache() -> None:
+    """Delete the oldest on-disk previews beyond PREVIEW_DISK_CACHE_MAX_FILES"""
+    cache_files = list(PREVIEW_DISK_CACHE_DIR.glob("*.png"))
+    if len(cache_files) <= PREVIEW_DISK_CACHE_MAX_FILES:
+        return
+    
+    cache_files.sort(key=lambda f: f.stat().st_mtime)
+    for cache_file in cache_files[:len(cache_files) - PREVIEW_DISK_CACHE_MAX_FILES]:
+        cache_file.unlink(missing_ok=True)
+
+
 def generate_preview_image(
     file_path: str, 
     max_size: Tuple[int, int], 
@@ -36,6 +216,10 @@ def generate_preview_image(
     """
     Generate a preview image from a specific page of a PDF file.
     
+    Rendered previews are cached in memory and on disk, keyed by the file's
+    path and modification time, so repeated previews skip rendering. The
+    returned image may be shared with the cache and must not be modified.
+    
     Args:
         file_path: Path to the PDF file
         max_size: Tuple of (max_width, max_height) for the preview area
@@ -47,71 +231,156 @@ def generate_preview_image(
         with a light gray border around it, or None if an error occurs
     """
     try:
-        # Open the PDF document
-        doc = fitz.open(file_path)
-        
-        if len(doc) == 0:
-            doc.close()
-            raise ValueError("PDF file is empty or has no pages")
-        
-        # Validate page number
-        if page_number < 0 or page_number >= len(doc):
-            doc.close()
-            raise ValueError(f"Page {page_number} does not exist. PDF has {len(doc)} pages.")
-        
-        # Get the specified page
-        page = doc[page_number]
-        
-        # Calculate zoom factor to render at good quality
-        # Higher zoom = better quality but larger image
-        zoom = 2.0  # 2x zoom for good quality
-        mat = fitz.Matrix(zoom, zoom)
-        
-        # Render page to a pixmap (image)
-        pix = page.get_pixmap(matrix=mat)
+        stat = os.stat(file_path)
+    except OSError as e:
+        logger.error("Error generating preview image: %s", e)
+        return None
+    
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, tuple(max_size), page_number, border_size)
+    
+    img = _preview_cache_get(key)
+    if img is None:
+        img = _render_preview_image(file_path, max_size, page_number, border_size)
+        if img is not None:
+            _preview_cache_put(key, img)
+    
+    return img
+
+
+def _render_preview_image(
+    file_path: str,
+    max_size: Tuple[int, int],
+    page_number: int,
+    border_size: int
+) -> Optional[Image.Image]:
+    """Render a bordered preview image (uncached implementation of generate_preview_image)"""
+    try:
+        # Open the PDF document (shared with other previews of the same file)
+        with open_pdf_cached(file_path) as doc:
+            return _render_page(doc, max_size, page_number, border_size)
         
-        # Convert pixmap to PIL Image
+    except Exception as e:
+        logger.error("Error generating preview image: %s", e)
+        return None
+
+
+def _render_page(
+    doc: fitz.Document,
+    max_size: Tuple[int, int],
+    page_number: int,
+    border_size: int
+) -> Image.Image:
+    """Render one page of an open document as a bordered preview image"""
+    if len(doc) == 0:
+        raise ValueError("PDF file is empty or has no pages")
+    
+    # Validate page number
+    if page_number < 0 or page_number >= len(doc):
+        raise ValueError(f"Page {page_number} does not exist. PDF has {len(doc)} pages.")
+    
+    # Get the specified page
+    page = doc[page_number]
+    
+    # Calculate the maximum available size (accounting for border)
+    # Subtract border from both dimensions (left+right, top+bottom)
+    max_width = max_size[0] - (border_size * 2)
+    max_height = max_size[1] - (border_size * 2)
+    
+    # Calculate the original aspect ratio from the page geometry
+    page_width, page_height = page.rect.width, page.rect.height
+    original_aspect = page_width / page_height
+    
+    # Calculate target size while preserving aspect ratio (contain, not cover)
+    max_aspect = max_width / max_height
+    
+    if original_aspect > max_aspect:
+        # Image is wider - fit to width
+        target_width = max_width
+        target_height = max(int(max_width / original_aspect), 1)
+    else:
+        # Image is taller - fit to height
+        target_height = max_height
+        target_width = max(int(max_height * original_aspect), 1)
+    
+    # Render close to the target resolution instead of a fixed zoom, so no
+    # oversized pixmap is rasterized and then thrown away. A small
+    # oversample gives LANCZOS some extra detail to downscale from.
+    zoom = (target_width / page_width) * PREVIEW_OVERSAMPLE
+    zoom = min(max(zoom, PREVIEW_MIN_ZOOM), PREVIEW_MAX_ZOOM)
+    mat = fitz.Matrix(zoom, zoom)
+    
+    # Render page to a pixmap (image), pinned to plain RGB without alpha so
+    # MuPDF skips alpha compositing and the buffer matches PIL's "RGB" mode
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
+    
+    # Convert pixmap to PIL Image, wrapping the MuPDF buffer without copying
+    try:
+        img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride, 1)
+    except AttributeError:
+        # Older PyMuPDF without samples_mv
         img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        
-        # Close the document
-        doc.close()
-        
-        # Calculate the original aspect ratio
-        original_width, original_height = img.size
-        original_aspect = original_width / original_height
-        
-        # Calculate the maximum available size (accounting for border)
-        # Subtract border from both dimensions (left+right, top+bottom)
-        max_width = max_size[0] - (border_size * 2)
-        max_height = max_size[1] - (border_size * 2)
-        
-        # Calculate target size while preserving aspect ratio (contain, not cover)
-        max_aspect = max_width / max_height
-        
-        if original_aspect > max_aspect:
-            # Image is wider - fit to width
-            target_width = max_width
-            target_height = int(max_width / original_aspect)
+    
+    # Resize to the exact target; LANCZOS for downscaling, BILINEAR if the
+    # zoom clamp left the render smaller than the target
+    if img.size != (target_width, target_height):
+        if img.width > target_width:
+            resample = Image.Resampling.LANCZOS
         else:
-            # Image is taller - fit to height
-            target_height = max_height
-            target_width = int(max_height * original_aspect)
-        
-        # Resize image using high-quality resampling while maintaining aspect ratio
-        resized_img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
-        
-        # Create a new image with border: light gray background
-        border_color = (220, 220, 220)  # Light gray RGB
-        bordered_img = Image.new("RGB", (target_width + border_size * 2, target_height + border_size * 2), border_color)
+            resample = Image.Resampling.BILINEAR
+        resized_img = img.resize((target_width, target_height), resample)
+    else:
+        resized_img = img
+    
+    # Add a light gray border around the resized image. This creates a new
+    # image that owns its pixels, so it doesn't depend on the pixmap buffer.
+    border_color = (220, 220, 220)  # Light gray RGB
+    bordered_img = ImageOps.expand(resized_img, border=border_size, fill=border_color)
+    
+    return bordered_img
+
+
+def preview_render_loop(conn) -> None:
+    """
+    Serve preview render requests over a pipe (runs in a separate process).
+    
+    Rendering in its own process keeps PyMuPDF and PIL work from holding the
+    GIL of the GUI process. Each request is a tuple of
+    (file_path, max_size, page_number, prefetch_pages); the reply is
+    (size, RGB bytes), or (None, None) if the preview could not be generated.
+    After replying, the prefetch pages are rendered into the preview cache
+    until the next request arrives. Cached documents are closed when no
+    request arrives for PDF_DOC_CACHE_IDLE_SECONDS. A None request stops
+    the loop.
+    
+    Args:
+        conn: The child end of a multiprocessing.Pipe
+    """
+    while True:
+        try:
+            # Release open files while the user isn't browsing previews
+            if not conn.poll(PDF_DOC_CACHE_IDLE_SECONDS):
+                close_cached_pdfs()
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
         
-        # Paste the resized image onto the bordered image, centered
-        bordered_img.paste(resized_img, (border_size, border_size))
+        file_path, max_size, page_number, prefetch_pages = request
         
-        return bordered_img
+        img = generate_preview_image(file_path, max_size, page_number=page_number)
+        if img is None:
+            conn.send((None, None))
+        else:
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            conn.send((img.size, img.tobytes()))
         
-    except Exception as e:
-        print(f"Error generating preview image: {e}")
-        return None
+        # Warm the caches with likely next pages, stopping early for new work
+        for prefetch_path, prefetch_page in prefetch_pages:
+            if conn.poll():
+                break
+            generate_preview_image(prefetch_path, max_size, page_number=prefetch_page)
 
 
 def get_page_image(